@@ -3,7 +3,9 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "ged4py>=0.5.0",
+#     "orjson>=3.9",
 #     "pyyaml>=6.0",
+#     "xxhash>=3.0",
 # ]
 # ///
 """Generate TRMNL family JSON from a GEDCOM file.
@@ -21,10 +23,18 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.cache import compute_file_hash, load_cache, save_cache, is_cache_valid
+from src.cache import (
+    compute_file_hash,
+    compute_file_stat,
+    is_cache_stat_current,
+    is_cache_valid,
+    load_cache,
+    save_cache,
+    save_cache_stat,
+)
+from src.jsonio import dump_json, load_json
 from src.schema import family_to_current
 from src.selector import select_family_id
-from src.sources.gedcom_source import GedcomSource
 
 
 def main():
@@ -56,11 +66,22 @@ def main():
     cache_path = output_dir / "families.json"
     output_path = output_dir / "current.json"
 
-    # Check if we need to regenerate the cache
-    current_hash = compute_file_hash(gedcom_path)
+    # Check if we need to regenerate the cache: stat fields first, then
+    # content hash (refreshing the cached stat fields if only they changed)
+    current_stat = compute_file_stat(gedcom_path)
     cache = load_cache(cache_path)
+    cache_valid = is_cache_stat_current(cache, current_stat)
+    if not cache_valid:
+        current_hash = compute_file_hash(gedcom_path)
+        cache_valid = is_cache_valid(cache, current_hash)
+        if cache_valid:
+            save_cache_stat(cache_path, current_hash, current_stat)
+
+    source = None
+    if not cache_valid:
+        # Imported here so cache hits don't pay for loading ged4py
+        from src.sources.gedcom_source import GedcomSource
 
-    if not is_cache_valid(cache, current_hash):
         print(f"Parsing GEDCOM file: {gedcom_path}")
         source = GedcomSource(gedcom_path)
 
@@ -70,30 +91,33 @@ def main():
             print("(Eligible = has spouse + children + at least one parent)", file=sys.stderr)
             sys.exit(1)
 
-        families = [source.get_family(pid) for pid in eligible_ids]
-        save_cache(cache_path, current_hash, families)
-        print(f"Cached {len(families)} eligible families")
+        # Stream families into the cache
+        save_cache(cache_path, current_hash, source.iter_families(), current_stat)
+        print(f"Cached {len(eligible_ids)} eligible families")
+        family_ids = eligible_ids
     else:
         families = cache["families"]
         print(f"Using cached data ({len(families)} families)")
+        by_id = {f["id"]: f for f in families}
+        family_ids = list(by_id)
 
     # Read last family ID if exists
     last_id = None
     if output_path.exists():
         try:
-            with open(output_path) as f:
-                last_id = json.load(f).get("last_family_id")
+            last_id = load_json(output_path).get("last_family_id")
         except (json.JSONDecodeError, KeyError):
             pass
 
     # Select and write
-    family_ids = [f["id"] for f in families]
     selected_id = select_family_id(family_ids, last_id)
-    selected_family = next(f for f in families if f["id"] == selected_id)
+    if source is not None:
+        selected_family = source.get_family(selected_id)
+    else:
+        selected_family = by_id[selected_id]
     current_data = family_to_current(selected_family)
 
-    with open(output_path, 'w') as f:
-        json.dump(current_data, f, indent=2)
+    dump_json(output_path, current_data, indent=True)
 
     print(f"Generated: {output_path}")
     print(f"  Subject: {current_data['subject']['first_name']} {current_data['subject']['last_name']}")
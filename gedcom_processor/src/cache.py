@@ -2,59 +2,279 @@
 
 import hashlib
 import json
+import mmap
+import os
+import pickle
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
+from src.jsonio import encode_json, load_json
 
-def compute_file_hash(file_path: Path) -> str:
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Algorithm used by compute_file_hash. It is stored in the cache, so a
+# cache hashed with the other algorithm is rebuilt instead of compared.
+HASH_ALGO = "xxh3_128" if xxhash is not None else "sha256"
+
+# Read size for streaming files through the hasher
+HASH_CHUNK_SIZE = 1 << 17
+
+# Files in this range are hashed through a single mmap'd buffer; smaller
+# files aren't worth the mapping setup, larger ones would add VM pressure.
+MMAP_MIN_SIZE = 1 << 20
+MMAP_MAX_SIZE = 1 << 30
+
+# Families per pickle in the .pkl sidecar. save_cache holds one batch at a
+# time, and each batch costs one pickle.load call when reading it back.
+PICKLE_BATCH_SIZE = 256
+
+
+def compute_file_stat(file_path: Path) -> dict:
+    """Get the stat fields used to detect an unchanged file cheaply.
+
+    A single stat() call, so checking an unchanged GEDCOM never reads its
+    contents. If these fields differ from the cached ones the file may
+    still be unchanged (e.g. touched or copied), so callers fall back to
+    comparing content hashes. Inode and device numbers are specific to one
+    machine, so the fields are only ever stored locally, by save_cache_stat.
+
+    Args:
+        file_path: Path to file to stat.
+
+    Returns:
+        Dict with "size", "mtime_ns", "inode" and "device" keys. Inode
+        numbers are only unique per filesystem, so both identify the file.
+    """
+    st = file_path.stat()
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "inode": st.st_ino,
+        "device": st.st_dev,
+    }
+
+
+def compute_file_hash_sha256(file_path: Path) -> str:
     """Compute SHA256 hash of a file's contents.
 
+    Reads the whole file, so cache checks only call it when the file's
+    stat fields no longer match the cached ones.
+
     Args:
         file_path: Path to file to hash.
 
     Returns:
         Hex string of SHA256 hash.
     """
-    sha256 = hashlib.sha256()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if MMAP_MIN_SIZE < size <= MMAP_MAX_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        # file_digest reads into a reusable buffer in C; unbuffered open
+        # avoids a second copy through Python's BufferedReader.
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def compute_file_hash(file_path: Path) -> str:
+    """Compute a content hash of a file for change detection.
+
+    Uses xxHash's XXH3-128 when xxhash is installed; it is many times
+    faster than SHA-256 and, as only accidental changes need detecting,
+    strong enough. Without xxhash, falls back to compute_file_hash_sha256.
+    HASH_ALGO names the algorithm in use.
+
+    Args:
+        file_path: Path to file to hash.
+
+    Returns:
+        Hex string of the hash.
+    """
+    if xxhash is None:
+        return compute_file_hash_sha256(file_path)
+
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if MMAP_MIN_SIZE < size <= MMAP_MAX_SIZE:
+            # Hash straight from the page cache, with no read copies
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return xxhash.xxh3_128_hexdigest(mm)
+
+        h = xxhash.xxh3_128()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(view[:n])
+        return h.hexdigest()
+
+
+def _pickle_path(cache_path: Path) -> Path:
+    """Return the pickle sidecar path for a families.json cache."""
+    return cache_path.with_suffix('.pkl')
+
+
+def _stat_path(cache_path: Path) -> Path:
+    """Return the GEDCOM stat sidecar path for a families.json cache."""
+    return cache_path.with_suffix('.stat.json')
+
+
+def _load_stat(cache_path: Path, gedcom_hash: Optional[str]) -> Optional[dict]:
+    """Return the GEDCOM stat fields recorded for a cache's hash, or None."""
+    try:
+        recorded = load_json(_stat_path(cache_path))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(recorded, dict) or recorded.get("gedcom_hash") != gedcom_hash:
+        return None
+    return recorded.get("gedcom_stat")
+
+
+def _load_pickle(pickle_path: Path) -> dict:
+    """Read a pickle sidecar written by save_cache.
+
+    The sidecar is a header dict followed by lists of families and a None
+    end marker, each pickled separately.
+    """
+    with open(pickle_path, 'rb') as f:
+        cache = pickle.load(f)
+        families = []
+        while (batch := pickle.load(f)) is not None:
+            families.extend(batch)
+    cache["families"] = families
+    return cache
 
 
 def load_cache(cache_path: Path) -> Optional[dict]:
     """Load the families cache if it exists.
 
+    Reads the pickle sidecar written by save_cache when it is at least as
+    new as families.json, since unpickling is several times faster than
+    decoding JSON; otherwise reads families.json itself.
+
     Args:
         cache_path: Path to families.json.
 
     Returns:
-        Cache dict with 'gedcom_hash' and 'families' keys, or None.
+        Cache dict with 'gedcom_stat', 'hash_algo', 'gedcom_hash' and
+        'families' keys, or None. 'gedcom_stat' comes from the local stat
+        sidecar and is None unless it was recorded for the same hash.
     """
-    if not cache_path.exists():
+    try:
+        json_mtime = cache_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
 
+    # The sidecar is only ever written by us next to our own cache, so
+    # unpickling it doesn't cross a trust boundary
+    cache = None
     try:
-        with open(cache_path) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, KeyError):
-        return None
+        pickle_path = _pickle_path(cache_path)
+        if pickle_path.stat().st_mtime_ns >= json_mtime:
+            cache = _load_pickle(pickle_path)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    if cache is None:
+        try:
+            cache = load_json(cache_path)
+        except (json.JSONDecodeError, KeyError):
+            return None
 
+    cache["gedcom_stat"] = _load_stat(cache_path, cache.get("gedcom_hash"))
+    return cache
 
-def save_cache(cache_path: Path, gedcom_hash: str, families: list[dict]) -> None:
+
+def save_cache(
+    cache_path: Path,
+    gedcom_hash: str,
+    families: Iterable[dict],
+    gedcom_stat: Optional[dict] = None
+) -> None:
     """Save extracted families to cache.
 
+    Families are encoded and written one at a time, so a generator can be
+    passed without building the whole encoded document in memory. The file
+    is compact JSON of the form {"hash_algo": ..., "gedcom_hash": ...,
+    "families": [...]}, so it depends only on the GEDCOM's content.
+    The same data is pickled alongside, PICKLE_BATCH_SIZE families at a
+    time, to a .pkl sidecar for faster loading. It is written to a
+    temporary file and renamed so readers never see it partially written.
+    If given, gedcom_stat is then recorded with save_cache_stat.
+
     Args:
         cache_path: Path to write families.json.
-        gedcom_hash: SHA256 hash of source GEDCOM file.
-        families: List of family dicts in TRMNL-ready format.
+        gedcom_hash: Content hash of source GEDCOM file, from
+            compute_file_hash.
+        families: Family dicts in TRMNL-ready format.
+        gedcom_stat: Stat fields of source GEDCOM file, from
+            compute_file_stat.
     """
-    cache = {
-        "gedcom_hash": gedcom_hash,
-        "families": families
-    }
-    with open(cache_path, 'w') as f:
-        json.dump(cache, f, indent=2)
+    pickle_path = _pickle_path(cache_path)
+    tmp_path = pickle_path.with_name(pickle_path.name + '.tmp')
+    header = {"hash_algo": HASH_ALGO, "gedcom_hash": gedcom_hash}
+    with open(tmp_path, 'wb') as pf:
+        pickle.dump(header, pf, protocol=5)
+        with open(cache_path, 'wb') as f:
+            f.write(b'{"hash_algo":' + encode_json(HASH_ALGO)
+                    + b',"gedcom_hash":' + encode_json(gedcom_hash) + b',"families":[')
+            batch = []
+            for i, family in enumerate(families):
+                if i:
+                    f.write(b',')
+                f.write(encode_json(family))
+                batch.append(family)
+                if len(batch) == PICKLE_BATCH_SIZE:
+                    pickle.dump(batch, pf, protocol=5)
+                    batch = []
+            f.write(b']}')
+        # Finished after the JSON, so the sidecar's mtime marks it as current
+        if batch:
+            pickle.dump(batch, pf, protocol=5)
+        pickle.dump(None, pf, protocol=5)
+    os.replace(tmp_path, pickle_path)
+
+    if gedcom_stat is not None:
+        save_cache_stat(cache_path, gedcom_hash, gedcom_stat)
+
+
+def save_cache_stat(cache_path: Path, gedcom_hash: str, gedcom_stat: dict) -> None:
+    """Record the stat fields of the GEDCOM a cache was built from.
+
+    Stat fields only mean something on the machine that took them, so they
+    go in a .stat.json sidecar next to families.json rather than in it;
+    families.json is committed and must not change when only they do. The
+    content hash is stored with them so they are ignored once the cache is
+    rebuilt for other content.
+
+    Args:
+        cache_path: Path to families.json.
+        gedcom_hash: Content hash the cache was built for, from
+            compute_file_hash.
+        gedcom_stat: Stat fields of source GEDCOM file, from
+            compute_file_stat.
+    """
+    stat_path = _stat_path(cache_path)
+    tmp_path = stat_path.with_name(stat_path.name + '.tmp')
+    tmp_path.write_bytes(encode_json({"gedcom_hash": gedcom_hash, "gedcom_stat": gedcom_stat}))
+    os.replace(tmp_path, stat_path)
+
+
+def is_cache_stat_current(cache: Optional[dict], current_stat: dict) -> bool:
+    """Check if the cache was saved for a GEDCOM with the same stat fields.
+
+    Args:
+        cache: Loaded cache dict, or None.
+        current_stat: Stat fields of current GEDCOM file.
+
+    Returns:
+        True if cache exists and its recorded stat fields match.
+    """
+    if cache is None:
+        return False
+    return cache.get("gedcom_stat") == current_stat
 
 
 def is_cache_valid(cache: Optional[dict], current_hash: str) -> bool:
@@ -62,11 +282,12 @@ def is_cache_valid(cache: Optional[dict], current_hash: str) -> bool:
 
     Args:
         cache: Loaded cache dict, or None.
-        current_hash: Hash of current GEDCOM file.
+        current_hash: Content hash of current GEDCOM file, from
+            compute_file_hash.
 
     Returns:
-        True if cache exists and hash matches.
+        True if cache exists and was hashed with HASH_ALGO to the same hash.
     """
     if cache is None:
         return False
-    return cache.get("gedcom_hash") == current_hash
+    return cache.get("hash_algo") == HASH_ALGO and cache.get("gedcom_hash") == current_hash
@@ -0,0 +1,59 @@
+"""JSON file reading and writing, using orjson when it is installed."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON file.
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        The decoded JSON value.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    data = path.read_bytes()
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_json(obj: Any, indent: bool = False) -> bytes:
+    """Encode a value as UTF-8 JSON.
+
+    Args:
+        obj: JSON-serializable value.
+        indent: If True, pretty-print with two-space indentation;
+            otherwise produce compact JSON.
+
+    Returns:
+        Encoded JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def dump_json(path: Path, obj: Any, indent: bool = False) -> None:
+    """Write a value to a JSON file as UTF-8.
+
+    Args:
+        path: Path to write.
+        obj: JSON-serializable value.
+        indent: If True, pretty-print with two-space indentation;
+            otherwise write compact JSON.
+    """
+    path.write_bytes(encode_json(obj, indent))
@@ -1,16 +1,33 @@
 """GEDCOM to TRMNL JSON processor with caching."""
 
 import json
+from dataclasses import dataclass
 from pathlib import Path
 
-from src.cache import compute_file_hash, load_cache, save_cache, is_cache_valid
+from src.cache import (
+    compute_file_hash,
+    compute_file_stat,
+    is_cache_stat_current,
+    is_cache_valid,
+    load_cache,
+    save_cache,
+    save_cache_stat,
+)
 from src.config import load_config
+from src.jsonio import dump_json, load_json
 from src.schema import family_to_current
 from src.selector import select_family_id
-from src.sources.gedcom_source import GedcomSource
 
 
-def run(config_path: Path, output_dir: Path) -> None:
+@dataclass(frozen=True)
+class RunResult:
+    """Outcome of a run() call."""
+
+    cache_hit: bool     # families came from the cache, without parsing GEDCOM
+    selected_id: str    # family ID written to current.json
+
+
+def run(config_path: Path, output_dir: Path) -> RunResult:
     """Run the GEDCOM processor.
 
     On first run or when GEDCOM changes:
@@ -22,21 +39,40 @@ def run(config_path: Path, output_dir: Path) -> None:
     Args:
         config_path: Path to config.yml.
         output_dir: Directory to write families.json and current.json.
+
+    Returns:
+        RunResult saying whether the cache was used and which family was
+        selected.
     """
     # Load config
     config = load_config(config_path)
 
     # Paths
-    gedcom_path = config_path.parent / config["gedcom_file"]
+    gedcom_path = Path(config["gedcom_file"])
+    if not gedcom_path.is_absolute():
+        gedcom_path = config_path.parent / gedcom_path
     cache_path = output_dir / "families.json"
     output_path = output_dir / "current.json"
 
-    # Check if we need to regenerate the cache
-    current_hash = compute_file_hash(gedcom_path)
+    # Check if we need to regenerate the cache. Matching stat fields mean
+    # the GEDCOM is unchanged without reading it; otherwise compare content
+    # hashes, and if only the stat fields changed, record the new ones
+    # locally, leaving the committed families.json untouched.
+    current_stat = compute_file_stat(gedcom_path)
     cache = load_cache(cache_path)
-
-    if not is_cache_valid(cache, current_hash):
+    cache_valid = is_cache_stat_current(cache, current_stat)
+    if not cache_valid:
+        current_hash = compute_file_hash(gedcom_path)
+        cache_valid = is_cache_valid(cache, current_hash)
+        if cache_valid:
+            save_cache_stat(cache_path, current_hash, current_stat)
+
+    source = None
+    if not cache_valid:
         # Parse GEDCOM and extract all eligible families
+        # Imported here so cache hits don't pay for loading ged4py
+        from src.sources.gedcom_source import GedcomSource
+
         print(f"Parsing GEDCOM file: {gedcom_path}")
         source = GedcomSource(gedcom_path)
 
@@ -44,42 +80,44 @@ def run(config_path: Path, output_dir: Path) -> None:
         if not eligible_ids:
             raise ValueError("No eligible families found in GEDCOM file")
 
-        # Extract all families in TRMNL-ready format
-        families = [source.get_family(pid) for pid in eligible_ids]
-
-        # Save cache
-        save_cache(cache_path, current_hash, families)
-        print(f"Cached {len(families)} families to {cache_path}")
+        # Extract all families in TRMNL-ready format, streaming them into
+        # the cache
+        save_cache(cache_path, current_hash, source.iter_families(), current_stat)
+        print(f"Cached {len(eligible_ids)} families to {cache_path}")
+        family_ids = eligible_ids
     else:
         families = cache["families"]
         print(f"Using cached data ({len(families)} families)")
+        by_id = {f["id"]: f for f in families}
+        family_ids = list(by_id)
 
-    if not families:
+    if not family_ids:
         raise ValueError("No families available")
 
     # Read last family ID from current.json if it exists
     last_id = None
     if output_path.exists():
         try:
-            with open(output_path) as f:
-                existing = json.load(f)
-                last_id = existing.get("last_family_id")
+            existing = load_json(output_path)
+            last_id = existing.get("last_family_id")
         except (json.JSONDecodeError, KeyError):
             pass
 
     # Select next family
-    family_ids = [f["id"] for f in families]
     selected_id = select_family_id(family_ids, last_id)
 
     # Find the selected family and convert to current.json format
-    selected_family = next(f for f in families if f["id"] == selected_id)
+    if source is not None:
+        selected_family = source.get_family(selected_id)
+    else:
+        selected_family = by_id[selected_id]
     current_data = family_to_current(selected_family)
 
     # Write output
-    with open(output_path, 'w') as f:
-        json.dump(current_data, f, indent=2)
+    dump_json(output_path, current_data, indent=True)
 
     print(f"Selected family {selected_id} -> {output_path}")
+    return RunResult(cache_hit=cache_valid, selected_id=selected_id)
 
 
 def main() -> None:
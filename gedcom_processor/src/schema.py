@@ -78,6 +78,8 @@ def family_to_current(family: dict) -> dict:
     Returns:
         Dictionary ready for current.json output.
     """
-    result = {k: v for k, v in family.items() if k != "id"}
-    result["last_family_id"] = family["id"]
+    # A C-level dict copy instead of a per-key comprehension; popping and
+    # re-adding the ID keeps last_family_id as the final key
+    result = dict(family)
+    result["last_family_id"] = result.pop("id")
     return result
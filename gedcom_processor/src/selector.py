@@ -20,14 +20,15 @@ def select_family_id(eligible_ids: list[str], last_id: Optional[str]) -> str:
     if not eligible_ids:
         raise ValueError("No eligible families to select from")
 
-    if len(eligible_ids) == 1:
+    n = len(eligible_ids)
+    if n == 1:
         return eligible_ids[0]
 
-    # Filter out last_id if present
-    candidates = [id for id in eligible_ids if id != last_id]
-
-    # If somehow all were filtered (shouldn't happen with len > 1), use all
-    if not candidates:
-        candidates = eligible_ids
-
-    return random.choice(candidates)
+    # One draw, plus a second only when it lands on last_id: that second
+    # draw picks uniformly among the other n-1 positions, so every other
+    # ID ends up with probability 1/(n-1). No list copy, no retry loop.
+    index = random.randrange(n)
+    pick = eligible_ids[index]
+    if pick == last_id:
+        pick = eligible_ids[(index + 1 + random.randrange(n - 1)) % n]
+    return pick
@@ -1,6 +1,7 @@
 """Abstract base class for family data sources."""
 
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 
 class FamilySource(ABC):
@@ -41,3 +42,16 @@ class FamilySource(ABC):
             }
         """
         pass
+
+    def iter_families(self) -> Iterator[dict]:
+        """Yield family data for every eligible person.
+
+        Sources that can build families in bulk should override this; the
+        default calls get_family once per eligible ID.
+
+        Yields:
+            Dictionaries in the same format as get_family, with an "id"
+            key holding the person ID.
+        """
+        for person_id in self.get_eligible_ids():
+            yield self.get_family(person_id)
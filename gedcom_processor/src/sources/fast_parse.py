@@ -0,0 +1,268 @@
+"""Fast line scanner for the INDI and FAM fields GedcomSource needs.
+
+ged4py reads files one byte at a time and builds a Record tree for every
+record, which dominates cache rebuilds. This module matches the same line
+grammar in a single forward pass over the file and keeps only the fields
+used for family extraction, decoding values the way ged4py does.
+
+Anything it cannot reproduce exactly (non-default dialects, pointer-valued
+NAME/BIRT/DEAT/DATE records, syntax or nesting errors, non-ASCII-based
+encodings) makes scan_gedcom return None so the caller can fall back to
+ged4py, which also reports any errors.
+"""
+
+import codecs
+import re
+from pathlib import Path
+from typing import Iterator
+
+from ged4py.parser import CodecError, guess_codec
+
+# Same grammar as ged4py's parser: level, optional @xref@, tag, optional value
+_GEDCOM_LINE = re.compile(
+    rb"^[ ]*(\d+)(?:[ ]*(@[A-Z-a-z0-9][^@]*@))?[ ]*([A-Z-a-z0-9_]+)(?:[ ](.*))?$"
+)
+
+_CONT_CONC = (b"CONT", b"CONC")
+
+# HEAD SOUR values that make ged4py switch to a non-default name dialect
+_DIALECT_SOURCES = ("MYHERITAGE", "ALTREE", "AgelongTree", "ANCESTRIS")
+
+# Sub-records where ged4py would follow a pointer value to another record
+_FOLLOWED_TAGS = (b"NAME", b"BIRT", b"DEAT", b"DATE")
+
+# Level-1 tags kept for each kind of level-0 record
+_INDI_TAGS = (b"NAME", b"BIRT", b"DEAT", b"FAMS", b"FAMC")
+_FAM_TAGS = (b"HUSB", b"WIFE", b"CHIL")
+_HEAD_TAGS = (b"SOUR",)
+_EVENT_TAGS = (b"BIRT", b"DEAT")
+
+
+def _is_pointer(value: bytes | None) -> bool:
+    """Check whether a raw value has the @ref@ pointer form."""
+    return bool(value) and len(value) > 2 and value[0] == 64 and value[-1] == 64
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """Split "Given /Surname/" into (given, surname) like ged4py."""
+    given, _, rest = name.partition("/")
+    surname, _, _ = rest.partition("/")
+    return given.strip(), surname.strip()
+
+
+def scan_gedcom(file_path: Path) -> tuple[dict, dict] | None:
+    """Scan a GEDCOM file for individual and family fields.
+
+    Args:
+        file_path: Path to the .ged file.
+
+    Returns:
+        Tuple (individuals, families) mapping xref ids to field tuples, or
+        None if the file needs the full ged4py parser. Individual tuples are
+        (first_name, last_name, birth_date, death_date, fams, famc)
+        where the dates are raw DATE text; family tuples are
+        (husb, wife, children). Both dicts are in file order.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            codec, bom_size = guess_codec(f)
+            # The line grammar is matched on bytes, which needs an
+            # ASCII-based codec
+            if codecs.lookup(codec).name.startswith(("utf-16", "utf-32")):
+                return None
+            f.seek(bom_size)
+            return _scan_lines(_read_lines(f, codec), codec)
+    except (CodecError, OSError, UnicodeDecodeError):
+        return None
+
+
+def _read_lines(f, codec: str) -> Iterator[bytes]:
+    """Yield the lines of a binary file, split like bytes.splitlines.
+
+    Values are only decoded for kept fields, so every line is also fed to
+    an incremental decoder; ged4py raises for bad bytes in any INDI or FAM.
+    Reading line by line keeps memory proportional to the kept fields
+    rather than the file.
+    """
+    check_decode = codecs.getincrementaldecoder(codec)().decode
+    for chunk in f:
+        check_decode(chunk)
+        # Iteration splits on LF only; ged4py also accepts bare CR
+        yield from chunk.splitlines()
+    check_decode(b"", True)
+
+
+def _scan_lines(lines: Iterator[bytes], codec: str) -> tuple[dict, dict] | None:
+    """Collect INDI and FAM field tuples from GEDCOM lines.
+
+    Args:
+        lines: Raw lines without line terminators.
+        codec: Codec the file is encoded with.
+
+    Returns:
+        Same as scan_gedcom.
+    """
+
+    individuals = {}
+    families = {}
+    record_tag = None     # tag of the current level-0 record
+    record_xref = None
+    fields = []           # kept level-1 nodes of the current record
+    stack = []            # per-level node, or None for untracked lines
+    prev_level = None
+    prev_tag = None
+    is_first_record = True
+    head_source = None
+
+    def finish_record():
+        """Turn the kept nodes of the finished record into a field tuple."""
+        nonlocal head_source
+        if record_tag == b"INDI":
+            individuals[record_xref] = _individual_fields(fields, codec)
+        elif record_tag == b"FAM":
+            families[record_xref] = _family_fields(fields, codec)
+        elif record_tag == b"HEAD" and is_first_record:
+            for node in fields:
+                head_source = node[1]
+                break
+
+    for line in lines:
+        match = _GEDCOM_LINE.match(line.lstrip())
+        if match is None:
+            return None
+        level_bytes, xref, tag, value = match.groups()
+        level = int(level_bytes)
+
+        # Same structural checks as ged4py; it raises, we defer to it
+        if prev_level is not None:
+            if level - prev_level > 1:
+                return None
+            if tag in _CONT_CONC:
+                if prev_tag in _CONT_CONC:
+                    if level != prev_level:
+                        return None
+                elif level - prev_level != 1:
+                    return None
+        prev_level = level
+        prev_tag = tag
+
+        del stack[level:]
+        if len(stack) < level:
+            # Lines before the first level-0 record, which ged4py skips
+            stack.extend([None] * (level - len(stack)))
+        if tag in _CONT_CONC:
+            parent = stack[level - 1] if level else None
+            if parent is not None:
+                if tag == b"CONT":
+                    value = b"\n" + (value or b"")
+                if value is not None:
+                    parent[1] = value if parent[1] is None else parent[1] + value
+            stack.append(None)
+            continue
+
+        node = None
+        if level == 0:
+            if record_tag is not None:
+                finish_record()
+                is_first_record = False
+            if tag in (b"INDI", b"FAM") and _is_pointer(value):
+                return None
+            record_tag = tag
+            record_xref = xref.decode(codec) if xref else None
+            fields = []
+            node = [tag, value, None]
+        elif level == 1 and stack[0] is not None:
+            if record_tag == b"INDI":
+                kept = _INDI_TAGS
+            elif record_tag == b"FAM":
+                kept = _FAM_TAGS
+            elif record_tag == b"HEAD":
+                kept = _HEAD_TAGS
+            else:
+                kept = ()
+            if tag in kept:
+                if record_tag == b"INDI" and tag in _FOLLOWED_TAGS and _is_pointer(value):
+                    return None
+                node = [tag, value, [] if tag in _EVENT_TAGS else None]
+                fields.append(node)
+        elif level == 2 and tag == b"DATE":
+            parent = stack[1]
+            if parent is not None and parent[2] is not None:
+                if _is_pointer(value):
+                    return None
+                node = [tag, value, None]
+                parent[2].append(node)
+        stack.append(node)
+
+    if record_tag is not None:
+        finish_record()
+
+    if head_source is not None and head_source.decode(codec) in _DIALECT_SOURCES:
+        return None
+
+    return individuals, families
+
+
+def _first(fields: list, tag: bytes) -> list | None:
+    """Return the first kept node with a tag, like ged4py's sub_tag."""
+    for node in fields:
+        if node[0] == tag:
+            return node
+    return None
+
+
+def _event_date(fields: list, tag: bytes, codec: str) -> str | None:
+    """Return the raw DATE text of the first BIRT or DEAT node."""
+    event = _first(fields, tag)
+    if event is None:
+        return None
+    date = _first(event[2], b"DATE")
+    if date is None or date[1] is None:
+        return None
+    return date[1].decode(codec)
+
+
+def _individual_fields(fields: list, codec: str) -> tuple:
+    """Build the field tuple for an INDI record."""
+    first_name = ""
+    last_name = ""
+    fams = []
+    famc = None
+    for node in fields:
+        tag = node[0]
+        if tag == b"FAMS":
+            if node[1]:
+                fams.append(node[1].decode(codec))
+        elif tag == b"FAMC":
+            if famc is None and node[1]:
+                famc = node[1].decode(codec)
+
+    name = _first(fields, b"NAME")
+    if name is not None:
+        first_name, last_name = _split_name(name[1].decode(codec) if name[1] else "")
+
+    return (
+        first_name,
+        last_name,
+        _event_date(fields, b"BIRT", codec),
+        _event_date(fields, b"DEAT", codec),
+        fams,
+        famc,
+    )
+
+
+def _family_fields(fields: list, codec: str) -> tuple:
+    """Build the field tuple for a FAM record."""
+    husb = None
+    wife = None
+    children = []
+    for tag, value, _ in fields:
+        if not value:
+            continue
+        if tag == b"HUSB":
+            husb = value.decode(codec)
+        elif tag == b"WIFE":
+            wife = value.decode(codec)
+        else:
+            children.append(value.decode(codec))
+    return husb, wife, children
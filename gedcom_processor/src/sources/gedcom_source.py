@@ -1,17 +1,70 @@
-"""GEDCOM file data source using ged4py library."""
+"""GEDCOM file data source using a line scanner, backed by ged4py."""
 
 import re
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import compress
 from pathlib import Path
+from typing import Iterator
 from ged4py import GedcomReader
+from ged4py.date import DateValue
 
+from src.schema import make_family_entry
 from .base import FamilySource
+from .fast_parse import scan_gedcom
+
+_NO_PARENTS = (None, None)
+
+# A number with a leading zero, which ged4py's DateValue renders without it
+_LEADING_ZERO = re.compile(r"(?<!\d)0\d")
+
+
+@dataclass(slots=True)
+class _Person:
+    """Fields extracted from an INDI record."""
+
+    first_name: str
+    last_name: str
+    birth: str | None
+    death: str | None
+    fams: list[str]
+    famc: str | None
+
+
+@dataclass(slots=True)
+class _Family:
+    """Fields extracted from a FAM record."""
+
+    husb: str | None
+    wife: str | None
+    children: list[str]
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex definition of a word character (\\w)."""
+    return char.isalnum() or char == "_"
+
+
+def _find_year_in_token(token: str) -> str | None:
+    """Find the first standalone 4-digit run in a whitespace-free token."""
+    n = len(token)
+    for i in range(n - 3):
+        candidate = token[i:i + 4]
+        if (candidate.isdecimal()
+                and (i == 0 or not _is_word_char(token[i - 1]))
+                and (i + 4 == n or not _is_word_char(token[i + 4]))):
+            return candidate
+    return None
 
 
 class GedcomSource(FamilySource):
     """Data source that reads from GEDCOM files.
 
-    Uses ged4py library which supports GEDCOM 5.5.1 format.
-    GEDCOM 5.5 files are also supported as 5.5.1 is backward compatible.
+    Reads the few fields it needs with fast_parse.scan_gedcom, falling
+    back to the ged4py library for files the scanner can't read exactly
+    like it. ged4py supports GEDCOM 5.5.1 format; GEDCOM 5.5 files are also
+    supported as 5.5.1 is backward compatible.
     """
 
     def __init__(self, file_path: Path):
@@ -22,21 +75,77 @@ class GedcomSource(FamilySource):
         """
         self._file_path = file_path
         # Store extracted data, not ged4py records (which require open file)
-        self._individuals = {}  # id -> {name, sex, birth, death, fams, famc}
-        self._families = {}     # id -> {husb, wife, children}
-
-        with GedcomReader(str(file_path)) as reader:
-            # Extract individual data
-            for record in reader.records0("INDI"):
-                indi_data = self._extract_individual(record)
-                self._individuals[record.xref_id] = indi_data
-
-            # Extract family data
-            for record in reader.records0("FAM"):
-                fam_data = self._extract_family(record)
-                self._families[record.xref_id] = fam_data
-
-    def _extract_individual(self, record) -> dict:
+        self._individuals: dict[str, _Person] = {}
+        self._families: dict[str, _Family] = {}
+
+        # ged4py's record tree is slow to build; the scanner returns None
+        # for anything it can't handle exactly like ged4py
+        scanned = scan_gedcom(file_path)
+        if scanned is not None:
+            self._load_scanned(*scanned)
+        else:
+            with GedcomReader(str(file_path)) as reader:
+                # Extract individual data
+                for record in reader.records0("INDI"):
+                    indi_data = self._extract_individual(record)
+                    self._individuals[record.xref_id] = indi_data
+
+                # Extract family data
+                for record in reader.records0("FAM"):
+                    fam_data = self._extract_family(record)
+                    self._families[record.xref_id] = fam_data
+
+        # Resolve relationships once so family extraction is plain dict
+        # lookups instead of FAM record walks
+        self._parents_of = {}       # id -> (father_id, mother_id), if any parent known
+        self._spouse_of = {}        # id -> spouse id in first FAMS family, if spouse exists
+
+        # Eligibility criteria as parallel flag arrays indexed like _ids, so
+        # get_eligible_ids combines whole columns instead of testing people
+        # one at a time
+        self._ids = list(self._individuals)
+        count = len(self._ids)
+        self._has_spouse = bytearray(count)
+        self._has_parents = bytearray(count)   # on subject or spouse side
+        self._has_children = bytearray(count)  # in first FAMS family
+        spouses = []                           # (index, spouse id) pairs
+        for index, person in enumerate(self._individuals.values()):
+            person_id = self._ids[index]
+            if person.famc:
+                family = self._families.get(person.famc)
+                if family and (family.husb or family.wife):
+                    self._parents_of[person_id] = (family.husb, family.wife)
+                    self._has_parents[index] = 1
+            if person.fams:
+                family = self._families.get(person.fams[0])
+                if family:
+                    spouse_id = self._get_spouse_id(person_id, family)
+                    if spouse_id in self._individuals:
+                        self._spouse_of[person_id] = spouse_id
+                        self._has_spouse[index] = 1
+                        spouses.append((index, spouse_id))
+                    if family.children:
+                        self._has_children[index] = 1
+        for index, spouse_id in spouses:
+            if spouse_id in self._parents_of:
+                self._has_parents[index] = 1
+
+    def _load_scanned(self, individuals: dict, families: dict) -> None:
+        """Store records from fast_parse.scan_gedcom field tuples."""
+        for xref_id, fields in individuals.items():
+            first_name, last_name, birth_date, death_date, fams, famc = fields
+            self._individuals[xref_id] = _Person(
+                first_name=sys.intern(first_name),
+                last_name=sys.intern(last_name),
+                birth=self._extract_raw_year(birth_date),
+                death=self._extract_raw_year(death_date),
+                fams=fams,
+                famc=famc
+            )
+        for xref_id, (husb, wife, children) in families.items():
+            self._families[xref_id] = _Family(husb=husb, wife=wife, children=children)
+
+    def _extract_individual(self, record) -> _Person:
         """Extract data from an INDI record."""
         # Name - ged4py returns tuple (given, surname, suffix)
         name_rec = record.sub_tag("NAME")
@@ -56,9 +165,9 @@ class GedcomSource(FamilySource):
                 else:
                     first_name = name_val.strip()
 
-        # Sex
-        sex_rec = record.sub_tag("SEX")
-        sex = sex_rec.value if sex_rec else None
+        # Names repeat heavily across a tree; share one string per name
+        first_name = sys.intern(first_name)
+        last_name = sys.intern(last_name)
 
         # Birth
         birth = None
@@ -76,30 +185,27 @@ class GedcomSource(FamilySource):
             if date_rec and date_rec.value:
                 death = self._extract_year(date_rec.value)
 
-        # Families as spouse (FAMS) - use sub_records to get Pointer values
+        # Families as spouse (all FAMS) and as child (first FAMC) in one
+        # pass - use sub_records to get Pointer values
         fams = []
-        for rec in record.sub_records:
-            if rec.tag == "FAMS" and rec.value:
-                fams.append(rec.value)
-
-        # Family as child (FAMC) - use sub_records to get Pointer value
         famc = None
         for rec in record.sub_records:
-            if rec.tag == "FAMC" and rec.value:
+            tag = rec.tag
+            if tag == "FAMS" and rec.value:
+                fams.append(rec.value)
+            elif tag == "FAMC" and famc is None and rec.value:
                 famc = rec.value
-                break
 
-        return {
-            "first_name": first_name,
-            "last_name": last_name,
-            "sex": sex,
-            "birth": birth,
-            "death": death,
-            "fams": fams,
-            "famc": famc
-        }
+        return _Person(
+            first_name=first_name,
+            last_name=last_name,
+            birth=birth,
+            death=death,
+            fams=fams,
+            famc=famc
+        )
 
-    def _extract_family(self, record) -> dict:
+    def _extract_family(self, record) -> _Family:
         """Extract data from a FAM record."""
         husb = None
         wife = None
@@ -113,11 +219,7 @@ class GedcomSource(FamilySource):
             elif rec.tag == "CHIL" and rec.value:
                 children.append(rec.value)
 
-        return {
-            "husb": husb,
-            "wife": wife,
-            "children": children
-        }
+        return _Family(husb=husb, wife=wife, children=children)
 
     def _extract_year(self, date_value) -> str | None:
         """Extract year from a GEDCOM date value.
@@ -126,166 +228,191 @@ class GedcomSource(FamilySource):
         """
         if date_value is None:
             return None
-        # Convert to string and extract 4-digit year
-        date_str = str(date_value)
-        match = re.search(r'\b(\d{4})\b', date_str)
-        return match.group(1) if match else None
+        # Convert to string and return the first standalone 4-digit run
+        # (same result as re.search(r'\b(\d{4})\b')). Most tokens are
+        # all digits or all letters, so only mixed tokens need scanning.
+        for token in str(date_value).split():
+            if token.isdecimal():
+                if len(token) == 4:
+                    return token
+            elif not token.isalpha():
+                year = _find_year_in_token(token)
+                if year:
+                    return year
+        return None
 
-    def get_eligible_ids(self) -> list[str]:
-        """Return list of eligible person IDs.
+    def _extract_raw_year(self, date_text: str | None) -> str | None:
+        """Extract year from raw DATE text, matching _extract_year on ged4py.
+
+        ged4py prints parsed numbers as ASCII integers without leading
+        zeros, so text where that can change a digit run goes through
+        DateValue first.
+        """
+        if date_text and (not date_text.isascii() or _LEADING_ZERO.search(date_text)):
+            return self._extract_year(DateValue.parse(date_text))
+        return self._extract_year(date_text)
+
+    @cached_property
+    def eligible_ids(self) -> list[str]:
+        """Eligible person IDs, computed once per source.
 
         Eligibility requires:
         - Has a spouse
         - Has at least one parent (on subject or spouse side)
         - Has at least one child
         """
-        eligible = []
-
-        for person_id, person in self._individuals.items():
-            if self._is_eligible(person_id, person):
-                eligible.append(person_id)
-
-        return eligible
-
-    def _is_eligible(self, person_id: str, person: dict) -> bool:
-        """Check if a person meets eligibility criteria."""
-        # Must have a spouse (be in a family as spouse)
-        if not person["fams"]:
-            return False
-
-        # Check first spouse family for children
-        family_id = person["fams"][0]
-        family = self._families.get(family_id)
-        if not family or not family["children"]:
-            return False
-
-        # Must have an actual spouse in the family (not just be listed in a FAM record)
-        spouse_id = self._get_spouse_id(person_id, family)
-        spouse = self._individuals.get(spouse_id) if spouse_id else None
-        if spouse is None:
-            return False
-
-        # Must have at least one parent (on either side)
-        person_parents = self._get_parents(person)
-        spouse_parents = self._get_parents(spouse)
-
-        has_any_parent = (
-            person_parents[0] is not None or
-            person_parents[1] is not None or
-            spouse_parents[0] is not None or
-            spouse_parents[1] is not None
+        # AND the flag arrays as big integers, one C-level pass per column;
+        # the result has a 1 byte exactly where all three flags are set
+        count = len(self._ids)
+        eligible = (
+            int.from_bytes(self._has_spouse)
+            & int.from_bytes(self._has_parents)
+            & int.from_bytes(self._has_children)
         )
+        return list(compress(self._ids, eligible.to_bytes(count)))
 
-        return has_any_parent
+    def get_eligible_ids(self) -> list[str]:
+        """Return list of eligible person IDs.
+
+        Returns the cached eligible_ids list; callers must not modify it.
+        """
+        return self.eligible_ids
 
-    def _get_spouse_id(self, person_id: str, family: dict) -> str | None:
+    def _get_spouse_id(self, person_id: str, family: _Family) -> str | None:
         """Get the spouse ID of a person in a family."""
-        if person_id == family["husb"]:
-            return family["wife"]
-        elif person_id == family["wife"]:
-            return family["husb"]
+        if person_id == family.husb:
+            return family.wife
+        elif person_id == family.wife:
+            return family.husb
         return None
 
-    def _get_parents(self, person: dict | None) -> tuple:
-        """Get (father_id, mother_id) for a person."""
-        if person is None or not person["famc"]:
-            return (None, None)
-
-        family = self._families.get(person["famc"])
-        if not family:
-            return (None, None)
-
-        return (family["husb"], family["wife"])
-
     def get_family(self, person_id: str) -> dict:
         """Extract family data for a person in TRMNL-ready format."""
-        from src.schema import make_person, make_family_entry
+        ind = self._individuals
+        p2d = self._person_to_dict
 
-        person = self._individuals.get(person_id)
+        person = ind.get(person_id)
         if person is None:
             raise ValueError(f"Person {person_id} not found")
 
-        # Get spouse and family
-        family = None
-        spouse = None
-        spouse_id = None
-        if person["fams"]:
-            family_id = person["fams"][0]
-            family = self._families.get(family_id)
-            if family:
-                spouse_id = self._get_spouse_id(person_id, family)
-                spouse = self._individuals.get(spouse_id) if spouse_id else None
-
-        # Get parents
-        subject_father_id, subject_mother_id = self._get_parents(person)
-        subject_father = self._individuals.get(subject_father_id) if subject_father_id else None
-        subject_mother = self._individuals.get(subject_mother_id) if subject_mother_id else None
-
-        spouse_father_id, spouse_mother_id = self._get_parents(spouse) if spouse else (None, None)
-        spouse_father = self._individuals.get(spouse_father_id) if spouse_father_id else None
-        spouse_mother = self._individuals.get(spouse_mother_id) if spouse_mother_id else None
+        # Get spouse and family (get(None) is None, so no guards needed)
+        family = self._families.get(person.fams[0]) if person.fams else None
+        spouse_id = self._spouse_of.get(person_id)
+        spouse = ind.get(spouse_id)
 
         # Get children with their spouses
         children_data = []
         if family:
-            for child_id in family["children"]:
-                child = self._individuals.get(child_id)
-                if child:
-                    child_entry = self._make_child_entry(child_id, child)
-                    children_data.append(child_entry)
+            make_child = self._make_child_entry
+            children_data = [
+                make_child(child_id, child)
+                for child_id in family.children
+                if (child := ind.get(child_id))
+            ]
 
         return make_family_entry(
             family_id=person_id,
-            subject=self._person_to_dict(person),
-            spouse=self._person_to_dict(spouse) if spouse else None,
-            subject_parents={
-                "father": self._person_to_dict(subject_father),
-                "mother": self._person_to_dict(subject_mother)
-            },
-            spouse_parents={
-                "father": self._person_to_dict(spouse_father),
-                "mother": self._person_to_dict(spouse_mother)
-            },
+            subject=p2d(person),
+            spouse=p2d(spouse),
+            subject_parents=self._parents_to_dict(person_id),
+            spouse_parents=self._parents_to_dict(spouse_id),
             children=children_data
         )
 
-    def _person_to_dict(self, person: dict | None) -> dict | None:
-        """Convert internal person dict to output schema format."""
-        from src.schema import make_person
+    def iter_families(self) -> Iterator[dict]:
+        """Yield family data for every eligible person in one pass.
+
+        Walks FAM records once instead of resolving each eligible person
+        separately. Each eligible person is a partner in their first FAMS
+        family, so when both partners are eligible their entries share the
+        partner, parent and child dicts built for that family. Entries come
+        in FAM record order, husband first.
+        """
+        ind = self._individuals
+        p2d = self._person_to_dict
+        make_child = self._make_child_entry
+        eligible = set(self.get_eligible_ids())
+
+        for family_id, family in self._families.items():
+            husb_id = family.husb
+            wife_id = family.wife
+            husb_eligible = husb_id in eligible and ind[husb_id].fams[0] == family_id
+            wife_eligible = (wife_id != husb_id and wife_id in eligible
+                             and ind[wife_id].fams[0] == family_id)
+            if not (husb_eligible or wife_eligible):
+                continue
+
+            # Eligible people always have a spouse, so both partners exist
+            husb = p2d(ind[husb_id])
+            wife = p2d(ind[wife_id])
+            husb_parents = self._parents_to_dict(husb_id)
+            wife_parents = self._parents_to_dict(wife_id)
+            children = [
+                make_child(child_id, child)
+                for child_id in family.children
+                if (child := ind.get(child_id))
+            ]
+
+            if husb_eligible:
+                yield make_family_entry(
+                    family_id=husb_id,
+                    subject=husb,
+                    spouse=wife,
+                    subject_parents=husb_parents,
+                    spouse_parents=wife_parents,
+                    children=children
+                )
+            if wife_eligible:
+                yield make_family_entry(
+                    family_id=wife_id,
+                    subject=wife,
+                    spouse=husb,
+                    subject_parents=wife_parents,
+                    spouse_parents=husb_parents,
+                    children=children
+                )
+
+    def _parents_to_dict(self, person_id: str | None) -> dict:
+        """Build the father/mother dict for a person's parents."""
+        ind = self._individuals
+        father_id, mother_id = self._parents_of.get(person_id, _NO_PARENTS)
+        return {
+            "father": self._person_to_dict(ind.get(father_id)),
+            "mother": self._person_to_dict(ind.get(mother_id))
+        }
+
+    def _person_to_dict(self, person: _Person | None) -> dict | None:
+        """Convert internal person record to output schema format.
 
+        Builds the same dict as schema.make_person, inlined because it runs
+        for every parent, spouse and child of every cached family.
+        """
         if person is None:
             return None
 
-        return make_person(
-            first_name=person["first_name"],
-            last_name=person["last_name"],
-            birth=person["birth"],
-            death=person["death"]
-        )
+        return {
+            "first_name": person.first_name,
+            "last_name": person.last_name,
+            "birth": person.birth,
+            "death": person.death
+        }
 
-    def _make_child_entry(self, child_id: str, child: dict) -> dict:
+    def _make_child_entry(self, child_id: str, child: _Person) -> dict:
         """Create a child entry with optional spouse."""
-        from src.schema import make_person
-
-        child_dict = make_person(
-            first_name=child["first_name"],
-            last_name=child["last_name"],
-            birth=child["birth"],
-            death=child["death"],
-            child=True
-        )
+        child_dict = {
+            "first_name": child.first_name,
+            "last_name": child.last_name,
+            "birth": child.birth,
+            "death": child.death,
+            "child": True
+        }
 
-        # Check if child has a spouse
-        if child["fams"]:
-            child_family_id = child["fams"][0]
-            child_family = self._families.get(child_family_id)
-            if child_family:
-                child_spouse_id = self._get_spouse_id(child_id, child_family)
-                child_spouse = self._individuals.get(child_spouse_id) if child_spouse_id else None
-                if child_spouse:
-                    return {
-                        "first": child_dict,
-                        "second": self._person_to_dict(child_spouse)
-                    }
+        # Check if child has a spouse (get(None) is None)
+        child_spouse = self._individuals.get(self._spouse_of.get(child_id))
+        if child_spouse:
+            return {
+                "first": child_dict,
+                "second": self._person_to_dict(child_spouse)
+            }
 
         return {"first": child_dict}
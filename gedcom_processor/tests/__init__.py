@@ -0,0 +1,35 @@
+"""Test package; makes the project root importable so tests can use ``src``.
+
+Both pytest and ``python -m unittest discover`` import this package before
+any test module, so the path is set up once for the whole run. It also
+holds helpers shared between test modules.
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@functools.cache
+def fixture_source(name: str = "test_family.ged"):
+    """Parse a fixture GEDCOM once per test run and share the result.
+
+    Callers must not mutate the returned source.
+
+    Args:
+        name: File name under tests/fixtures.
+
+    Returns:
+        GedcomSource for the fixture.
+    """
+    # Imported here so test modules that don't parse GEDCOM skip ged4py
+    from src.sources.gedcom_source import GedcomSource
+
+    return GedcomSource(FIXTURES_DIR / name)
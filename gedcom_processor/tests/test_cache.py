@@ -1,27 +1,74 @@
 """Tests for the families.json cache layer."""
 
 import unittest
-import sys
 import json
+import os
 import hashlib
 import tempfile
 from pathlib import Path
+from unittest import mock
 
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+from src import cache
+from src.cache import (
+    HASH_ALGO,
+    MMAP_MIN_SIZE,
+    compute_file_hash,
+    compute_file_hash_sha256,
+    compute_file_stat,
+    load_cache,
+    save_cache,
+    save_cache_stat,
+    is_cache_stat_current,
+    is_cache_valid,
+)
 
-from src.cache import compute_file_hash, load_cache, save_cache, is_cache_valid
 
+class TestComputeFileStat(unittest.TestCase):
+    """Tests for compute_file_stat."""
 
-class TestComputeFileHash(unittest.TestCase):
-    """Tests for compute_file_hash."""
+    def test_stat_stable_for_unchanged_file(self):
+        """compute_file_stat is the same for an untouched file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "family.ged"
+            path.write_text("test content")
+
+            self.assertEqual(compute_file_stat(path), compute_file_stat(path))
+            self.assertEqual(set(compute_file_stat(path)), {"size", "mtime_ns", "inode", "device"})
+
+    def test_stat_changes_when_file_changes(self):
+        """compute_file_stat changes when size, mtime or inode changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "family.ged"
+            path.write_text("test content")
+            original = compute_file_stat(path)
+
+            path.write_text("test content, edited")
+            self.assertNotEqual(compute_file_stat(path), original)
 
-    def test_compute_file_hash(self):
-        """compute_file_hash returns SHA256 of file contents."""
+            resized = compute_file_stat(path)
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertNotEqual(compute_file_stat(path), resized)
+
+            # Replacing the file gives it a new inode
+            touched = compute_file_stat(path)
+            copy = Path(tmpdir) / "copy.ged"
+            copy.write_bytes(path.read_bytes())
+            os.utime(copy, ns=(st.st_atime_ns, touched["mtime_ns"]))
+            os.replace(copy, path)
+            self.assertNotEqual(compute_file_stat(path), touched)
+
+
+class TestComputeFileHashSha256(unittest.TestCase):
+    """Tests for compute_file_hash_sha256."""
+
+    def test_compute_file_hash_sha256(self):
+        """compute_file_hash_sha256 returns SHA256 of file contents."""
         with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
             f.write("test content")
             f.flush()
 
-            hash1 = compute_file_hash(Path(f.name))
+            hash1 = compute_file_hash_sha256(Path(f.name))
 
             # Same content should give same hash
             self.assertEqual(len(hash1), 64)  # SHA256 hex length
@@ -30,6 +77,50 @@ class TestComputeFileHash(unittest.TestCase):
             expected = hashlib.sha256(b"test content").hexdigest()
             self.assertEqual(hash1, expected)
 
+    def test_compute_file_hash_sha256_large_file(self):
+        """compute_file_hash_sha256 hashes files above the mmap threshold."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "large.ged"
+            content = b"0 NOTE padding\n" * ((MMAP_MIN_SIZE // 15) + 1)
+            path.write_bytes(content)
+
+            self.assertGreater(len(content), MMAP_MIN_SIZE)
+            self.assertEqual(compute_file_hash_sha256(path), hashlib.sha256(content).hexdigest())
+
+
+class TestComputeFileHash(unittest.TestCase):
+    """Tests for compute_file_hash."""
+
+    @unittest.skipIf(cache.xxhash is None, "xxhash not installed")
+    def test_compute_file_hash_xxh3(self):
+        """compute_file_hash returns the XXH3-128 digest when xxhash is installed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "family.ged"
+            content = os.urandom(cache.HASH_CHUNK_SIZE * 2 + 123)
+            path.write_bytes(content)
+
+            self.assertEqual(HASH_ALGO, "xxh3_128")
+            self.assertEqual(compute_file_hash(path), cache.xxhash.xxh3_128_hexdigest(content))
+
+    @unittest.skipIf(cache.xxhash is None, "xxhash not installed")
+    def test_compute_file_hash_xxh3_large_file(self):
+        """compute_file_hash gives the same digest for files hashed via mmap."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "family.ged"
+            content = os.urandom(MMAP_MIN_SIZE + 1)
+            path.write_bytes(content)
+
+            self.assertEqual(compute_file_hash(path), cache.xxhash.xxh3_128_hexdigest(content))
+
+    def test_compute_file_hash_sha256_fallback(self):
+        """compute_file_hash falls back to SHA-256 without xxhash."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "family.ged"
+            path.write_text("test content")
+
+            with mock.patch.object(cache, "xxhash", None):
+                self.assertEqual(compute_file_hash(path), compute_file_hash_sha256(path))
+
 
 class TestLoadCache(unittest.TestCase):
     """Tests for load_cache."""
@@ -61,24 +152,141 @@ class TestSaveAndLoadCache(unittest.TestCase):
             self.assertEqual(len(loaded["families"]), 2)
             self.assertEqual(loaded["families"][0]["id"], "@I001@")
 
+    def test_save_cache_accepts_generator(self):
+        """save_cache streams families from any iterable, including empty ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "families.json"
+            families = [{"id": f"@I{i:03}@", "subject": {"first_name": "Zoë"}} for i in range(3)]
+
+            save_cache(cache_path, "abc123hash", (family for family in families))
+            self.assertEqual(
+                json.loads(cache_path.read_bytes()),
+                {"hash_algo": HASH_ALGO, "gedcom_hash": "abc123hash", "families": families}
+            )
+
+            # Stat fields, device included, stay out of the JSON document
+            gedcom_stat = {"size": 1, "mtime_ns": 2, "inode": 3, "device": 4}
+            save_cache(cache_path, "abc123hash", iter([]), gedcom_stat)
+            self.assertEqual(
+                json.loads(cache_path.read_bytes()),
+                {"hash_algo": HASH_ALGO, "gedcom_hash": "abc123hash", "families": []}
+            )
+            self.assertEqual(
+                load_cache(cache_path),
+                {"gedcom_stat": gedcom_stat, "hash_algo": HASH_ALGO, "gedcom_hash": "abc123hash", "families": []}
+            )
+
+    def test_load_cache_prefers_fresh_pickle(self):
+        """load_cache reads the pickle sidecar unless families.json is newer."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "families.json"
+            pickle_path = Path(tmpdir) / "families.pkl"
+            families = [{"id": "@I001@", "subject": {"first_name": "John"}}]
+            save_cache(cache_path, "abc123hash", families)
+            self.assertTrue(pickle_path.exists())
+
+            # Mark the JSON so we can tell which file was read
+            cache_path.write_text(json.dumps({"gedcom_hash": "from-json", "families": []}))
+            stat = pickle_path.stat()
+            os.utime(cache_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(load_cache(cache_path)["families"], families)
+
+            # A newer families.json makes the sidecar stale
+            os.utime(cache_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            self.assertEqual(load_cache(cache_path)["gedcom_hash"], "from-json")
+
+            # A corrupt sidecar falls back to JSON
+            os.utime(cache_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            pickle_path.write_bytes(b"not a pickle")
+            os.utime(pickle_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(load_cache(cache_path)["gedcom_hash"], "from-json")
+
+    def test_pickle_sidecar_written_in_batches(self):
+        """The sidecar round-trips families split across several batches."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "families.json"
+            pickle_path = Path(tmpdir) / "families.pkl"
+            families = [{"id": f"@I{i:03}@"} for i in range(5)]
+            with mock.patch.object(cache, "PICKLE_BATCH_SIZE", 2):
+                save_cache(cache_path, "abc123hash", iter(families))
+
+            cache_path.write_text(json.dumps({"gedcom_hash": "from-json", "families": []}))
+            stat = pickle_path.stat()
+            os.utime(cache_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(load_cache(cache_path)["families"], families)
+
+            # A sidecar cut off before its end marker falls back to JSON
+            pickle_path.write_bytes(pickle_path.read_bytes()[:-8])
+            os.utime(pickle_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(load_cache(cache_path)["gedcom_hash"], "from-json")
+
+    def test_gedcom_stat_kept_out_of_families_json(self):
+        """GEDCOM stat fields live in a local sidecar tied to the cache hash."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "families.json"
+            gedcom_stat = {"size": 1, "mtime_ns": 2, "inode": 3, "device": 4}
+            save_cache(cache_path, "abc123hash", [{"id": "@I001@"}], gedcom_stat)
+            self.assertNotIn("gedcom_stat", json.loads(cache_path.read_bytes()))
+            self.assertEqual(load_cache(cache_path)["gedcom_stat"], gedcom_stat)
+
+            # Refreshing the stat fields leaves families.json alone
+            content = cache_path.read_bytes()
+            mtime = cache_path.stat().st_mtime_ns
+            new_stat = {**gedcom_stat, "mtime_ns": 5}
+            save_cache_stat(cache_path, "abc123hash", new_stat)
+            self.assertEqual(cache_path.read_bytes(), content)
+            self.assertEqual(cache_path.stat().st_mtime_ns, mtime)
+            self.assertEqual(load_cache(cache_path)["gedcom_stat"], new_stat)
+
+            # Stat fields recorded for other content are ignored
+            save_cache_stat(cache_path, "otherhash", gedcom_stat)
+            self.assertIsNone(load_cache(cache_path)["gedcom_stat"])
+
 
 class TestIsCacheValid(unittest.TestCase):
     """Tests for is_cache_valid."""
 
     def test_is_cache_valid_true_when_hash_matches(self):
         """is_cache_valid returns True when GEDCOM hash matches."""
-        cache = {"gedcom_hash": "abc123", "families": []}
+        cache = {"hash_algo": HASH_ALGO, "gedcom_hash": "abc123", "families": []}
         self.assertTrue(is_cache_valid(cache, "abc123"))
 
     def test_is_cache_valid_false_when_hash_differs(self):
         """is_cache_valid returns False when GEDCOM hash differs."""
-        cache = {"gedcom_hash": "abc123", "families": []}
+        cache = {"hash_algo": HASH_ALGO, "gedcom_hash": "abc123", "families": []}
         self.assertFalse(is_cache_valid(cache, "different_hash"))
 
+    def test_is_cache_valid_false_when_algorithm_differs(self):
+        """is_cache_valid returns False for a cache hashed another way."""
+        cache = {"hash_algo": "md5", "gedcom_hash": "abc123", "families": []}
+        self.assertFalse(is_cache_valid(cache, "abc123"))
+        self.assertFalse(is_cache_valid({"gedcom_hash": "abc123", "families": []}, "abc123"))
+
     def test_is_cache_valid_false_when_cache_none(self):
         """is_cache_valid returns False when cache is None."""
         self.assertFalse(is_cache_valid(None, "any_hash"))
 
 
+class TestIsCacheStatCurrent(unittest.TestCase):
+    """Tests for is_cache_stat_current."""
+
+    def test_true_when_stat_matches(self):
+        """is_cache_stat_current returns True when stored stat fields match."""
+        gedcom_stat = {"size": 10, "mtime_ns": 20, "inode": 30, "device": 40}
+        cache = {"gedcom_stat": dict(gedcom_stat), "gedcom_hash": "abc123", "families": []}
+        self.assertTrue(is_cache_stat_current(cache, gedcom_stat))
+
+    def test_false_when_stat_differs_or_missing(self):
+        """is_cache_stat_current returns False for other or absent stat fields."""
+        gedcom_stat = {"size": 10, "mtime_ns": 20, "inode": 30, "device": 40}
+        cache = {"gedcom_stat": {**gedcom_stat, "mtime_ns": 21}, "gedcom_hash": "abc123"}
+        self.assertFalse(is_cache_stat_current(cache, gedcom_stat))
+        # Same inode number on another filesystem is a different file
+        cache = {"gedcom_stat": {**gedcom_stat, "device": 41}, "gedcom_hash": "abc123"}
+        self.assertFalse(is_cache_stat_current(cache, gedcom_stat))
+        self.assertFalse(is_cache_stat_current({"gedcom_hash": "abc123"}, gedcom_stat))
+        self.assertFalse(is_cache_stat_current(None, gedcom_stat))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,9 @@
 """Tests for configuration loading."""
 
 import unittest
-import sys
 import tempfile
 from pathlib import Path
 
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
-
 from src.config import load_config
 
 
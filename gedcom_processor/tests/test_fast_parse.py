@@ -0,0 +1,82 @@
+"""Tests for the fast GEDCOM line scanner."""
+
+import unittest
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from unittest import mock
+
+from src.sources import gedcom_source
+from src.sources.fast_parse import scan_gedcom
+from src.sources.gedcom_source import GedcomSource
+from tests import fixture_source
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _records(source: GedcomSource) -> tuple:
+    """Return a source's parsed records in comparable form."""
+    individuals = [(pid, asdict(p)) for pid, p in source._individuals.items()]
+    families = [(fid, asdict(f)) for fid, f in source._families.items()]
+    return individuals, families
+
+
+class TestScanGedcom(unittest.TestCase):
+    """Tests for scan_gedcom and its use by GedcomSource."""
+
+    def _write(self, tmpdir: str, text: bytes) -> Path:
+        path = Path(tmpdir) / "test.ged"
+        path.write_bytes(text)
+        return path
+
+    def test_matches_ged4py_on_fixtures(self):
+        """GedcomSource builds the same records with the scanner as with ged4py."""
+        for name in ("test_family.ged", "john_reyman_test_1.ged"):
+            with self.subTest(name=name):
+                path = FIXTURES / name
+                self.assertIsNotNone(scan_gedcom(path))
+
+                with mock.patch.object(gedcom_source, "scan_gedcom", return_value=None):
+                    expected = _records(GedcomSource(path))
+                self.assertEqual(_records(fixture_source(name)), expected)
+
+    def test_continuation_lines_and_leading_zero_years(self):
+        """CONC/CONT values and zero-padded years match ged4py."""
+        text = (
+            b"0 HEAD\r\n1 CHAR UTF-8\r\n"
+            b"0 @I1@ INDI\r\n1 NAME Jo\xc3\xabl /Sm\r\n2 CONC ith/\r\n"
+            b"1 BIRT\r\n2 DATE ABT 0850\r\n1 DEAT\r\n2 DATE 12 JAN\r\n3 CONT 1901\r\n"
+            b"1 FAMS @F1@\r\n"
+            b"0 @F1@ FAM\r\n1 HUSB @I1@\r\n0 TRLR\r\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self._write(tmpdir, text)
+            with mock.patch.object(gedcom_source, "scan_gedcom", return_value=None):
+                expected = _records(GedcomSource(path))
+            records = _records(GedcomSource(path))
+
+        self.assertEqual(records, expected)
+        person = records[0][0][1]
+        self.assertEqual((person["first_name"], person["last_name"]), ("Joël", "Smith"))
+        self.assertEqual((person["birth"], person["death"]), (None, "1901"))
+
+    def test_returns_none_for_other_dialects(self):
+        """Files from sources ged4py parses names differently for are skipped."""
+        text = b"0 HEAD\n1 SOUR MYHERITAGE\n1 CHAR UTF-8\n0 @I1@ INDI\n1 NAME A /B/\n0 TRLR\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assertIsNone(scan_gedcom(self._write(tmpdir, text)))
+
+    def test_returns_none_for_invalid_lines(self):
+        """Syntax and nesting errors are left for ged4py to report."""
+        for text in (
+            b"0 HEAD\n1 CHAR UTF-8\n\n0 TRLR\n",
+            b"0 HEAD\n1 CHAR UTF-8\n0 @I1@ INDI\n2 DATE 1850\n0 TRLR\n",
+        ):
+            with self.subTest(text=text):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    self.assertIsNone(scan_gedcom(self._write(tmpdir, text)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,11 @@
 """Tests for the GEDCOM data source."""
 
 import unittest
-import sys
 from pathlib import Path
 
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
-
 from src.sources.gedcom_source import GedcomSource
 from src.sources.base import FamilySource
+from tests import fixture_source
 
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_family.ged"
@@ -16,9 +14,14 @@ FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_family.ged"
 class TestGedcomSourceBasic(unittest.TestCase):
     """Tests for basic GEDCOM loading."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Parsing is the slow part, and no test mutates the source
+        cls.source = fixture_source()
+
     def test_gedcom_source_implements_interface(self):
         """GedcomSource implements FamilySource interface."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         self.assertIsInstance(source, FamilySource)
 
     def test_gedcom_source_loads_file(self):
@@ -31,9 +34,13 @@ class TestGedcomSourceBasic(unittest.TestCase):
 class TestGetEligibleIds(unittest.TestCase):
     """Tests for get_eligible_ids."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.source = fixture_source()
+
     def test_get_eligible_ids_returns_eligible_people(self):
         """get_eligible_ids returns people meeting criteria."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         eligible = source.get_eligible_ids()
 
         # I001 (John Doe) should be eligible: has spouse, parents, children
@@ -41,19 +48,29 @@ class TestGetEligibleIds(unittest.TestCase):
 
     def test_get_eligible_ids_excludes_ineligible(self):
         """get_eligible_ids excludes people missing requirements."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         eligible = source.get_eligible_ids()
 
         # I008 (Sarah Doe) has no spouse, should not be eligible
         self.assertNotIn("@I008@", eligible)
 
+    def test_get_eligible_ids_computed_once(self):
+        """get_eligible_ids returns the same cached list on every call."""
+        source = self.source
+        self.assertIs(source.get_eligible_ids(), source.get_eligible_ids())
+        self.assertIs(source.get_eligible_ids(), source.eligible_ids)
+
 
 class TestGetFamily(unittest.TestCase):
     """Tests for get_family."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.source = fixture_source()
+
     def test_get_family_returns_subject(self):
         """get_family includes subject data."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         family = source.get_family("@I001@")
 
         self.assertEqual(family["subject"]["first_name"], "John")
@@ -63,7 +80,7 @@ class TestGetFamily(unittest.TestCase):
 
     def test_get_family_returns_spouse(self):
         """get_family includes spouse data."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         family = source.get_family("@I001@")
 
         self.assertEqual(family["spouse"]["first_name"], "Jane")
@@ -71,7 +88,7 @@ class TestGetFamily(unittest.TestCase):
 
     def test_get_family_returns_subject_parents(self):
         """get_family includes subject's parents."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         family = source.get_family("@I001@")
 
         self.assertEqual(family["subject_parents"]["father"]["first_name"], "William")
@@ -79,7 +96,7 @@ class TestGetFamily(unittest.TestCase):
 
     def test_get_family_returns_spouse_parents(self):
         """get_family includes spouse's parents."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         family = source.get_family("@I001@")
 
         self.assertEqual(family["spouse_parents"]["father"]["first_name"], "Robert")
@@ -87,7 +104,7 @@ class TestGetFamily(unittest.TestCase):
 
     def test_get_family_returns_children(self):
         """get_family includes children with child flag."""
-        source = GedcomSource(FIXTURE_PATH)
+        source = self.source
         family = source.get_family("@I001@")
 
         children = family["children"]
@@ -100,5 +117,51 @@ class TestGetFamily(unittest.TestCase):
         self.assertEqual(james_entry["second"]["first_name"], "Alice")
 
 
+class TestIterFamilies(unittest.TestCase):
+    """Tests for iter_families."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source = fixture_source()
+
+    def test_iter_families_matches_get_family(self):
+        """iter_families yields the get_family entry of every eligible person."""
+        source = self.source
+        expected = {pid: source.get_family(pid) for pid in source.get_eligible_ids()}
+
+        families = list(source.iter_families())
+
+        self.assertEqual({f["id"]: f for f in families}, expected)
+        self.assertEqual(len(families), len(expected))
+
+
+class TestExtractYear(unittest.TestCase):
+    """Tests for DATE year extraction."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source = fixture_source()
+
+    def test_extract_year_matches_standalone_four_digits(self):
+        """_extract_year returns the first standalone 4-digit year."""
+        source = self.source
+        cases = {
+            "1850": "1850",
+            "12 MAR 1901": "1901",
+            "BET 1800 AND 1810": "1800",
+            "1750/51": "1750",
+            "(1850) 1860": "1850",
+            "ABT1850 1860": "1860",
+            "18500": None,
+            "1850s": None,
+            "EST 18": None,
+            "(unknown)": None,
+        }
+        for date_str, expected in cases.items():
+            self.assertEqual(source._extract_year(date_str), expected, date_str)
+
+        self.assertIsNone(source._extract_year(None))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,64 @@
+"""Tests for JSON file helpers."""
+
+import unittest
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from src import jsonio
+from src.jsonio import dump_json, load_json
+
+
+DATA = {"subject": {"first_name": "Zoë", "birth": "1850", "death": None}, "children": []}
+
+
+class TestJsonRoundTrip(unittest.TestCase):
+    """Tests for dump_json and load_json together."""
+
+    def test_round_trip_compact(self):
+        """dump_json writes compact JSON that load_json reads back."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "families.json"
+            dump_json(path, DATA)
+
+            self.assertNotIn(b"\n", path.read_bytes())
+            self.assertEqual(load_json(path), DATA)
+
+    def test_round_trip_indented(self):
+        """dump_json with indent=True pretty-prints."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "current.json"
+            dump_json(path, DATA, indent=True)
+
+            self.assertEqual(path.read_text(encoding="utf-8"), json.dumps(DATA, indent=2, ensure_ascii=False))
+            self.assertEqual(load_json(path), DATA)
+
+    def test_stdlib_fallback_matches(self):
+        """Without orjson, output is byte-identical to the orjson path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for indent in (False, True):
+                default_path = Path(tmpdir) / "default.json"
+                fallback_path = Path(tmpdir) / "fallback.json"
+                dump_json(default_path, DATA, indent=indent)
+                with mock.patch.object(jsonio, "orjson", None):
+                    dump_json(fallback_path, DATA, indent=indent)
+                    self.assertEqual(load_json(fallback_path), DATA)
+
+                self.assertEqual(fallback_path.read_bytes(), default_path.read_bytes())
+
+    def test_load_json_invalid_raises(self):
+        """load_json raises json.JSONDecodeError on invalid JSON."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "broken.json"
+            path.write_text("{not json")
+
+            with self.assertRaises(json.JSONDecodeError):
+                load_json(path)
+            with mock.patch.object(jsonio, "orjson", None):
+                with self.assertRaises(json.JSONDecodeError):
+                    load_json(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,35 +4,61 @@ import unittest
 import sys
 import json
 import tempfile
-import time
+import os
 import shutil
 from pathlib import Path
-
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+from unittest import mock
 
 from src.main import run
 
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures" / "test_family.ged"
+# JSON strings are valid YAML, so this quotes the path safely
+FIXTURE_CONFIG = f"gedcom_file: {json.dumps(str(FIXTURE_PATH))}\nsource: gedcom\n"
 
 
 class TestRun(unittest.TestCase):
     """Tests for main run() function."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Golden directory with a config pointing at the (read-only)
+        # fixture and the output of a first run, copied by tests that start
+        # from an existing cache
+        cls._golden_dir = tempfile.TemporaryDirectory()
+        cls.golden = Path(cls._golden_dir.name)
+        (cls.golden / "config.yml").write_text(FIXTURE_CONFIG)
+        run(cls.golden / "config.yml", cls.golden)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._golden_dir.cleanup()
+
+    def _copy_golden(self, tmpdir: str, own_gedcom: bool = False) -> Path:
+        """Copy the golden directory into tmpdir and return it as a Path.
+
+        With own_gedcom, also copy the fixture in and point the config at
+        the copy, for tests that modify the GEDCOM.
+        """
+        shutil.copytree(self.golden, tmpdir, dirs_exist_ok=True)
+        tmpdir = Path(tmpdir)
+        if own_gedcom:
+            shutil.copy(FIXTURE_PATH, tmpdir / "family.ged")
+            (tmpdir / "config.yml").write_text("gedcom_file: family.ged\nsource: gedcom\n")
+        return tmpdir
+
     def test_run_creates_cache_and_output(self):
         """run() creates families.json cache and current.json output."""
         with tempfile.TemporaryDirectory() as tmpdir:
             tmpdir = Path(tmpdir)
 
-            # Copy fixture GEDCOM
-            shutil.copy(FIXTURE_PATH, tmpdir / "family.ged")
-
-            # Create config
+            # Config only, pointing at the fixture
             config_path = tmpdir / "config.yml"
-            config_path.write_text("gedcom_file: family.ged\nsource: gedcom\n")
+            config_path.write_text(FIXTURE_CONFIG)
 
             # Run
-            run(config_path, tmpdir)
+            result = run(config_path, tmpdir)
+            self.assertFalse(result.cache_hit)
 
             # Verify cache created
             cache_path = tmpdir / "families.json"
@@ -56,42 +82,72 @@ class TestRun(unittest.TestCase):
     def test_run_uses_cache_on_second_run(self):
         """run() uses existing cache when GEDCOM unchanged."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-
-            # Copy fixture GEDCOM
-            shutil.copy(FIXTURE_PATH, tmpdir / "family.ged")
-
-            # Create config
+            tmpdir = self._copy_golden(tmpdir)
             config_path = tmpdir / "config.yml"
-            config_path.write_text("gedcom_file: family.ged\nsource: gedcom\n")
 
-            # First run - creates cache
-            run(config_path, tmpdir)
+            # First run
+            first = run(config_path, tmpdir)
+            self.assertTrue(first.cache_hit)
 
             cache_path = tmpdir / "families.json"
-            original_mtime = cache_path.stat().st_mtime
+            original_mtime = cache_path.stat().st_mtime_ns
 
             # Second run - should use cache (not modify it)
-            time.sleep(0.1)  # Ensure mtime would differ if rewritten
-            run(config_path, tmpdir)
+            second = run(config_path, tmpdir)
+            self.assertTrue(second.cache_hit)
 
             # Cache should be unchanged
-            self.assertEqual(cache_path.stat().st_mtime, original_mtime)
+            self.assertEqual(cache_path.stat().st_mtime_ns, original_mtime)
 
-    def test_run_regenerates_cache_when_gedcom_changes(self):
-        """run() regenerates cache when GEDCOM file changes."""
+    def test_run_refreshes_stat_when_only_mtime_changes(self):
+        """run() keeps the cache when the GEDCOM is touched but not edited."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-
+            tmpdir = self._copy_golden(tmpdir, own_gedcom=True)
             gedcom_path = tmpdir / "family.ged"
-            shutil.copy(FIXTURE_PATH, gedcom_path)
-
             config_path = tmpdir / "config.yml"
-            config_path.write_text("gedcom_file: family.ged\nsource: gedcom\n")
 
-            # First run
+            cache_path = tmpdir / "families.json"
+            original = cache_path.read_bytes()
+
+            # Touch the GEDCOM without changing its content
+            st = gedcom_path.stat()
+            os.utime(gedcom_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+            # Run again - same content hash, so no reparse
+            with mock.patch("src.sources.gedcom_source.GedcomSource") as source_cls:
+                result = run(config_path, tmpdir)
+            source_cls.assert_not_called()
+            self.assertTrue(result.cache_hit)
+
+            # The new stat fields are recorded locally; the committed
+            # families.json is left byte for byte as it was
+            self.assertEqual(cache_path.read_bytes(), original)
+            with open(tmpdir / "families.stat.json") as f:
+                recorded = json.load(f)
+            self.assertEqual(recorded["gedcom_stat"]["mtime_ns"], st.st_mtime_ns + 1_000_000_000)
+
+            # Next run trusts the refreshed stat fields without hashing
+            with mock.patch("src.main.compute_file_hash") as compute_hash:
+                self.assertTrue(run(config_path, tmpdir).cache_hit)
+            compute_hash.assert_not_called()
+
+    def test_run_cache_hit_skips_gedcom_parser(self):
+        """run() on a cache hit neither parses nor imports the GEDCOM parser."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = self._copy_golden(tmpdir)
+            config_path = tmpdir / "config.yml"
             run(config_path, tmpdir)
 
+            with mock.patch.dict(sys.modules, {"src.sources.gedcom_source": None}):
+                run(config_path, tmpdir)
+
+    def test_run_regenerates_cache_when_gedcom_changes(self):
+        """run() regenerates cache when GEDCOM file changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = self._copy_golden(tmpdir, own_gedcom=True)
+            gedcom_path = tmpdir / "family.ged"
+            config_path = tmpdir / "config.yml"
+
             cache_path = tmpdir / "families.json"
             with open(cache_path) as f:
                 original_hash = json.load(f)["gedcom_hash"]
@@ -101,8 +157,9 @@ class TestRun(unittest.TestCase):
             content = content.replace("0 TRLR", "0 NOTE Modified\n0 TRLR")
             gedcom_path.write_text(content)
 
-            # Second run - should regenerate cache
-            run(config_path, tmpdir)
+            # Run again - should regenerate cache
+            result = run(config_path, tmpdir)
+            self.assertFalse(result.cache_hit)
 
             with open(cache_path) as f:
                 new_hash = json.load(f)["gedcom_hash"]
@@ -112,21 +169,17 @@ class TestRun(unittest.TestCase):
     def test_run_avoids_last_family(self):
         """run() picks different family than last time."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-
-            shutil.copy(FIXTURE_PATH, tmpdir / "family.ged")
-
+            tmpdir = self._copy_golden(tmpdir)
             config_path = tmpdir / "config.yml"
-            config_path.write_text("gedcom_file: family.ged\nsource: gedcom\n")
-
             output_path = tmpdir / "current.json"
 
             # Run multiple times and collect IDs
             ids_seen = set()
             for _ in range(10):
-                run(config_path, tmpdir)
+                result = run(config_path, tmpdir)
                 with open(output_path) as f:
                     data = json.load(f)
+                self.assertEqual(data["last_family_id"], result.selected_id)
                 ids_seen.add(data["last_family_id"])
 
             # Should see variety (test fixture has multiple eligible people)
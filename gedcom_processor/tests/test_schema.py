@@ -1,8 +1,6 @@
 """Tests for output schema helpers."""
 
 import unittest
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
 from src.schema import make_person, make_family_entry, family_to_current
 
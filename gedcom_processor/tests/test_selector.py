@@ -1,8 +1,7 @@
 """Tests for the family selector."""
 
 import unittest
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
+from unittest import mock
 
 from src.selector import select_family_id
 
@@ -29,6 +28,16 @@ class TestSelectFamilyId(unittest.TestCase):
             result = select_family_id(eligible, last_id="I001")
             self.assertEqual(result, "I002")
 
+    def test_select_redraws_among_others_when_hitting_last_id(self):
+        """A draw that lands on last_id moves to one of the other IDs."""
+        eligible = ["I001", "I002", "I003", "I004", "I005"]
+
+        with mock.patch("src.selector.random.randrange", side_effect=[2, 0]):
+            self.assertEqual(select_family_id(eligible, last_id="I003"), "I004")
+        # Offsets wrap around past the end of the list
+        with mock.patch("src.selector.random.randrange", side_effect=[4, 3]):
+            self.assertEqual(select_family_id(eligible, last_id="I005"), "I004")
+
     def test_select_with_no_last_id(self):
         """With no last ID, can pick any option."""
         eligible = ["I001", "I002", "I003"]
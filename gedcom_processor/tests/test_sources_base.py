@@ -3,9 +3,6 @@
 import unittest
 from abc import ABC
 
-import sys
-sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
-
 from src.sources.base import FamilySource
 
 